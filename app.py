@@ -1,176 +1,443 @@
 import streamlit as st
-import networkx as nx
-import matplotlib.pyplot as plt
-from io import BytesIO
+import streamlit.components.v1 as components
+import re
+from array import array
+from collections import defaultdict, deque
+from importlib.util import find_spec
+from io import StringIO
+from shutil import which
 
 # Set page configuration
 st.set_page_config(page_title="Regex to NFA Converter", layout="wide")
 
+# Diagram backends and the package each one needs. The heavy plotting libraries are
+# only imported once a backend that uses them is selected.
+BACKENDS = {
+    "networkx-layered": "networkx",
+    "igraph-fr": "igraph",
+    "graphviz-dot": "graphviz",
+    "graphviz-neato": "graphviz",
+}
+
+def backend_available(package):
+    # The graphviz wrapper shells out to the Graphviz `dot` executable for every
+    # engine, so it is only usable when that binary is on the PATH too
+    if package == "graphviz" and which("dot") is None:
+        return False
+    return find_spec(package) is not None
+
+@st.cache_resource
+def load_networkx():
+    import networkx as nx
+    return nx
+
+@st.cache_resource
+def load_pyplot():
+    import matplotlib
+    matplotlib.use('Agg')  # Headless backend; avoids GUI imports under concurrent sessions
+    import matplotlib.pyplot as plt
+    return plt
+
+@st.cache_resource
+def load_igraph():
+    import igraph as ig  # Optional: much faster Fruchterman-Reingold layout
+    return ig
+
+@st.cache_resource
+def load_graphviz():
+    import graphviz  # Optional: Graphviz renderer (needs the Graphviz binaries)
+    return graphviz
+
+# Character classes used by the parser and NFA builder
+OPERATORS = frozenset('*|.')
+LEFT_PAREN_OR_PIPE = frozenset('(|')
+NOT_CONCAT_RIGHT = frozenset('|)*')
+PARENS = frozenset('()')
+
+# Operator precedence indexed by ord(c); anything that is not an operator is 0
+PREC_TABLE = bytearray(128)
+PREC_TABLE[ord('|')] = 1
+PREC_TABLE[ord('.')] = 2
+PREC_TABLE[ord('*')] = 3
+LEFT_PAREN, CONCAT = ord('('), ord('.')
+
+# Characters that must be escaped inside a quoted DOT label
+DOT_ESCAPES = str.maketrans({'\\': '\\\\', '"': '\\"'})
+
+# Root <svg> tag and its attributes, for making rendered diagrams responsive
+SVG_TAG = re.compile(r'<svg\b[^>]*>')
+SVG_SIZE_ATTRS = re.compile(r'\s(?:width|height)="[^"]*"')
+SVG_WIDTH = re.compile(r'\swidth="([\d.]+)(pt|px)?"')
+SVG_VIEWBOX = re.compile(r'viewBox="([^"]+)"')
+
+# Widest the diagram is expected to get in the wide page layout, used to size its iframe
+DIAGRAM_MAX_WIDTH = 1200
+
 # Helper functions for regex -> postfix -> NFA
 def infix_to_postfix(regex):
-    # Add concatenation operator '.' explicitly
-    def add_concat_operator(regex):
-        result = ""
-        for i in range(len(regex) - 1):
-            result += regex[i]
-            if regex[i] not in '(|' and regex[i+1] not in '|)*':
-                result += '.'
-        result += regex[-1] if regex else ""
-        return result
-    
-    # Process the regex with concatenation operators
-    new_regex = add_concat_operator(regex)
-    
-    # Convert to postfix
-    precedence = {'|': 1, '.': 2, '*': 3}
-    output, stack = [], []
-    
-    for c in new_regex:
-        if c not in precedence and c not in '()':
+    # Convert to postfix in a single pass. The explicit concatenation operator '.'
+    # is inserted on the fly between adjacent operands instead of in a separate pass.
+    # The operator stack only ever holds ASCII '(' and operators, so it is kept as
+    # a bytearray of their codes.
+    output, stack = [], bytearray()
+    prev = ''
+    
+    for c in regex:
+        if prev and prev not in LEFT_PAREN_OR_PIPE and c not in NOT_CONCAT_RIGHT:
+            while stack and stack[-1] != LEFT_PAREN and PREC_TABLE[stack[-1]] >= PREC_TABLE[CONCAT]:
+                output.append(chr(stack.pop()))
+            stack.append(CONCAT)
+        prev = c
+        
+        if c not in OPERATORS and c not in PARENS:
             output.append(c)
         elif c == '(':
-            stack.append(c)
+            stack.append(LEFT_PAREN)
         elif c == ')':
-            while stack and stack[-1] != '(':
-                output.append(stack.pop())
-            if stack and stack[-1] == '(':
+            while stack and stack[-1] != LEFT_PAREN:
+                output.append(chr(stack.pop()))
+            if stack:
                 stack.pop()
         else:
-            while stack and stack[-1] != '(' and precedence.get(stack[-1], 0) >= precedence.get(c, 0):
-                output.append(stack.pop())
-            stack.append(c)
+            code = ord(c)
+            prec = PREC_TABLE[code]
+            while stack and stack[-1] != LEFT_PAREN and PREC_TABLE[stack[-1]] >= prec:
+                output.append(chr(stack.pop()))
+            stack.append(code)
     
     while stack:
-        output.append(stack.pop())
+        output.append(chr(stack.pop()))
     
     return ''.join(output)
 
-class State:
-    count = 0
+def make_state_factory():
+    # Each build gets its own counter, so concurrent sessions never share state ids
+    n = [0]
+    
+    def new_id():
+        i = n[0]
+        n[0] += 1
+        return i
     
-    def __init__(self):
-        self.id = f"q{State.count}"
-        State.count += 1
-        self.is_final = False
+    return new_id
 
-def build_nfa(postfix):
+def build_nfa(postfix, new_id):
+    # States are plain integer ids from new_id(). Transitions are stored as three
+    # parallel arrays (source, symbol, destination). Fragments on the stack are
+    # (start, end) id pairs; their transitions are already in the arrays, so
+    # combining fragments only appends the new edges.
+    #
+    # Instead of emitting Thompson's ε-edges where it is safe, the two endpoints are
+    # recorded in `merges` and collapsed with a union-find at the end. A fragment's
+    # start never has incoming edges and its end never has outgoing ones, which is
+    # what keeps these merges from changing the accepted language.
+    #
+    # Every postfix token adds at most three transitions (a Kleene star), so the
+    # arrays are allocated once at that bound and filled through the `n_edges` cursor.
+    max_edges = 3 * len(postfix)
+    src, dst = array('l', [0]) * max_edges, array('l', [0]) * max_edges
+    sym = [''] * max_edges
+    n_edges = 0
+    merges = []
+    state_ids = []  # Ids allocated by this build, in order
     stack = []
     
+    def new_state():
+        state_ids.append(new_id())
+        return state_ids[-1]
+    
+    def add_transition(a, symbol, b):
+        nonlocal n_edges
+        src[n_edges], sym[n_edges], dst[n_edges] = a, symbol, b
+        n_edges += 1
+    
     for c in postfix:
-        if c not in {'*', '|', '.'}:
-            start, end = State(), State()
-            end.is_final = True  # Mark as potential final state
-            transitions = [(start.id, c, end.id)]
-            stack.append((start, end, transitions))
+        if c not in OPERATORS:
+            start, end = new_state(), new_state()
+            add_transition(start, c, end)
+            stack.append((start, end))
         elif c == '.':  # Concatenation
             if len(stack) < 2:
                 st.error(f"Invalid expression: not enough operands for '.' operation")
-                return None, None, []
+                return None, None, ([], [], [])
             s2 = stack.pop()
             s1 = stack.pop()
-            s1[1].is_final = False  # No longer a final state
-            transitions = s1[2] + [(s1[1].id, 'ε', s2[0].id)] + s2[2]
-            stack.append((s1[0], s2[1], transitions))
+            merges.append((s1[1], s2[0]))  # s1's end becomes s2's start
+            stack.append((s1[0], s2[1]))
         elif c == '|':  # Alternation
             if len(stack) < 2:
                 st.error(f"Invalid expression: not enough operands for '|' operation")
-                return None, None, []
+                return None, None, ([], [], [])
             s2 = stack.pop()
             s1 = stack.pop()
-            start, end = State(), State()
-            end.is_final = True
-            s1[1].is_final = False
-            s2[1].is_final = False
-            transitions = [
-                (start.id, 'ε', s1[0].id),
-                (start.id, 'ε', s2[0].id),
-                *s1[2],
-                *s2[2],
-                (s1[1].id, 'ε', end.id),
-                (s2[1].id, 'ε', end.id)
-            ]
-            stack.append((start, end, transitions))
+            # Share one start and one end between both branches
+            merges.append((s1[0], s2[0]))
+            merges.append((s1[1], s2[1]))
+            stack.append((s1[0], s1[1]))
         elif c == '*':  # Kleene star
             if not stack:
                 st.error(f"Invalid expression: not enough operands for '*' operation")
-                return None, None, []
+                return None, None, ([], [], [])
             s = stack.pop()
-            start, end = State(), State()
-            end.is_final = True
-            s[1].is_final = False
-            transitions = [
-                (start.id, 'ε', s[0].id),
-                (start.id, 'ε', end.id),
-                *s[2],
-                (s[1].id, 'ε', s[0].id),
-                (s[1].id, 'ε', end.id)
-            ]
-            stack.append((start, end, transitions))
+            start, end = new_state(), new_state()
+            merges.append((s[1], s[0]))  # Loop back by merging the body's end into its start
+            add_transition(start, 'ε', s[0])
+            add_transition(start, 'ε', end)
+            add_transition(s[1], 'ε', end)
+            stack.append((start, end))
     
     if not stack:
         st.error("Invalid expression: no valid NFA constructed")
-        return None, None, []
+        return None, None, ([], [], [])
     
-    return stack[0]
+    start, end = stack[0]
+    
+    # Collapse merged states, keeping the smallest id of each group as its representative
+    parent = {x: x for x in state_ids}
+    
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    
+    for a, b in merges:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+    
+    # Renumber the surviving states 0..n-1 in creation order and drop duplicate edges
+    src, sym, dst = src[:n_edges], sym[:n_edges], dst[:n_edges]
+    roots = sorted({find(x) for x in src} | {find(x) for x in dst})
+    new_ids = {root: i for i, root in enumerate(roots)}
+    edges = dict.fromkeys((new_ids[find(a)], symbol, new_ids[find(b)]) for a, symbol, b in zip(src, sym, dst))
+    src, sym, dst = (list(column) for column in zip(*edges)) if edges else ([], [], [])
+    return new_ids[find(start)], new_ids[find(end)], (src, sym, dst)
 
-def visualize_nfa(start, end, transitions):
+def layered_layout(G, source):
+    # Thompson NFAs are DAGs apart from their loop edges. Drop the back edges found
+    # by a DFS from the source, then place every node at its longest-path depth (x)
+    # and its order within that layer (y). Linear time, no iterative solver.
+    visit = {}  # 1 while a node is on the DFS stack, 2 once it is finished
+    back_edges = set()
+    for root in [source, *G]:
+        if root in visit:
+            continue
+        visit[root] = 1
+        stack = [(root, iter(G.successors(root)))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if child not in visit:
+                    visit[child] = 1
+                    stack.append((child, iter(G.successors(child))))
+                    break
+                if visit[child] == 1:
+                    back_edges.add((node, child))
+            else:
+                visit[node] = 2
+                stack.pop()
+    
+    indegree = dict.fromkeys(G, 0)
+    for a, b in G.edges():
+        if (a, b) not in back_edges:
+            indegree[b] += 1
+    level = dict.fromkeys(G, 0)
+    layers = defaultdict(list)
+    queue = deque(node for node in G if indegree[node] == 0)
+    while queue:
+        node = queue.popleft()
+        layers[level[node]].append(node)
+        for child in G.successors(node):
+            if (node, child) in back_edges:
+                continue
+            level[child] = max(level[child], level[node] + 1)
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                queue.append(child)
+    
+    pos = {}
+    for x, nodes in layers.items():
+        for rank, node in enumerate(nodes):
+            pos[node] = (x, (len(nodes) - 1) / 2 - rank)
+    return pos
+
+def layer_skipping_edges(G, pos):
+    # Edges of a layered_layout that jump over at least one layer, mapped to an arc3
+    # rad; drawn straight, they would run through the nodes of the layers in between.
+    # A positive rad bends an edge to its right, so bend away from the skipped node
+    # nearest the straight line (cross product < 0 means it lies on the right)
+    bends = {}
+    for a, b in G.edges():
+        (xa, ya), (xb, yb) = pos[a], pos[b]
+        if abs(xa - xb) <= 1.5:
+            continue
+        if (b, a) in bends:  # Negated, the rad of the reverse edge bends it the same way; bend it deeper
+            bends[(a, b)] = -1.6 * bends[(b, a)]
+            continue
+        lo, hi = sorted((xa, xb))
+        sides = [(xb - xa) * (y - ya) - (yb - ya) * (x - xa) for x, y in pos.values() if lo < x < hi]
+        nearest = min((side for side in sides if abs(side) > 1e-9), key=abs, default=0)
+        bends[(a, b)] = -0.3 if nearest < 0 else 0.3
+    return bends
+
+def visualize_nfa(start, end, transitions, layout="layered"):
+    nx, plt = load_networkx(), load_pyplot()
     G = nx.DiGraph()
     
     # Add explicit start node
     G.add_node("start", shape="circle", color="green")
-    G.add_edge("start", start.id, label="")
+    G.add_edge("start", f"q{start}", label="")
     
     # Add all states
     states = set()
-    for src, _, dst in transitions:
-        states.add(src)
-        states.add(dst)
+    src, sym, dst = transitions
+    states.update(src)
+    states.update(dst)
     
     for state in states:
-        if state == end.id:
-            G.add_node(state, shape="doublecircle", color="red")
-        else:
-            G.add_node(state, shape="circle", color="skyblue")
-    
-    # Add transitions
-    for src, symbol, dst in transitions:
-        if G.has_edge(src, dst):
-            # If edge exists, append new symbol to label
-            current_label = G.edges[src, dst]['label']
-            G.edges[src, dst]['label'] = f"{current_label},{symbol}"
+        if state == end:
+            G.add_node(f"q{state}", shape="doublecircle", color="red")
         else:
-            G.add_edge(src, dst, label=symbol)
+            G.add_node(f"q{state}", shape="circle", color="skyblue")
     
-    # Layout and draw
-    plt.figure(figsize=(12, 8))
+    # Add transitions, merging the symbols of parallel edges into one label
+    label_map = defaultdict(list)
+    for a, symbol, b in zip(src, sym, dst):
+        label_map[(a, b)].append(symbol)
+    for (a, b), symbols in label_map.items():
+        G.add_edge(f"q{a}", f"q{b}", label=','.join(symbols))
     
-    # Use spring layout instead of kamada_kawai_layout (which requires scipy)
-    pos = nx.spring_layout(G, k=0.30, iterations=50, seed=42)  # Added seed for consistency
+    # Layout and draw on an explicit figure so nothing leaks through pyplot's global state
+    fig, ax = plt.subplots(figsize=(12, 8))
+    
+    if layout == "fr":
+        # igraph's Fruchterman-Reingold runs in C; seed it with a circle for consistency
+        ig = load_igraph()
+        nodes = list(G.nodes())
+        index = {node: i for i, node in enumerate(nodes)}
+        graph = ig.Graph(n=len(nodes), edges=[(index[a], index[b]) for a, b in G.edges()], directed=True)
+        fr_layout = graph.layout_fruchterman_reingold(seed=graph.layout_circle().coords, niter=50)
+        pos = dict(zip(nodes, fr_layout.coords))
+        long_edges = {}
+    else:
+        pos = layered_layout(G, "start")
+        long_edges = layer_skipping_edges(G, pos)
     
     # Draw nodes
     node_colors = [G.nodes[n].get('color', 'skyblue') for n in G.nodes()]
-    nx.draw_networkx_nodes(G, pos, node_size=2000, node_color=node_colors)
+    nx.draw_networkx_nodes(G, pos, ax=ax, node_size=2000, node_color=node_colors)
     
     # Draw labels
-    nx.draw_networkx_labels(G, pos, font_size=12)
+    nx.draw_networkx_labels(G, pos, ax=ax, font_size=12)
     
-    # Draw edges with slight curve to avoid overlap
-    nx.draw_networkx_edges(G, pos, arrowsize=20, width=1.5, connectionstyle='arc3,rad=0.1')
+    # Draw edges with slight curve to avoid overlap; edges that skip over a layer
+    # bend further, away from the nodes in between, and so do
+    # pairs of merged states joined both ways (q0-a->q1-b->q0 for "(ab)*"), which
+    # with the same rad curve to opposite sides and so pull apart
+    bends = dict(long_edges)
+    for a, b in G.edges():
+        if a != b and G.has_edge(b, a) and (a, b) not in bends:
+            bends[(a, b)] = 0.2
+    short_edges = [edge for edge in G.edges() if edge not in bends]
+    nx.draw_networkx_edges(G, pos, ax=ax, edgelist=short_edges, arrowsize=20, width=1.5, connectionstyle='arc3,rad=0.1')
+    for rad in set(bends.values()):
+        bent_edges = [edge for edge, edge_rad in bends.items() if edge_rad == rad]
+        nx.draw_networkx_edges(G, pos, ax=ax, edgelist=bent_edges, arrowsize=20, width=1.5, connectionstyle=f'arc3,rad={rad}')
     
-    # Draw edge labels
+    # Draw edge labels; networkx centres self-loop labels on the node, so put those above it
     edge_labels = nx.get_edge_attributes(G, 'label')
-    nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=12)
+    loop_labels = {edge: label for edge, label in edge_labels.items() if edge[0] == edge[1]}
+    edge_labels = {edge: label for edge, label in edge_labels.items() if edge[0] != edge[1]}
+    arc_labels = {edge: (edge_labels.pop(edge), rad) for edge, rad in bends.items() if edge in edge_labels}
+    nx.draw_networkx_edge_labels(G, pos, ax=ax, edge_labels=edge_labels, font_size=12)
+    for (node, _), label in loop_labels.items():
+        ax.annotate(label, pos[node], xytext=(0, 52), textcoords='offset points', ha='center', fontsize=12)
+    
+    ax.margins(0.1)
+    bottom, top = ax.get_ylim()
+    if layout == "layered" and top - bottom < 2:  # Keep single-row layouts from stretching self-loops
+        middle = (top + bottom) / 2
+        ax.set_ylim(middle - 1, middle + 1)
+    ax.axis('off')
+    fig.tight_layout()
     
-    plt.axis('off')
-    plt.tight_layout()
+    # networkx puts edge labels on the straight line between the nodes, which for a
+    # bent edge is under the skipped node or on its reverse twin; arc3 puts the
+    # control point rad * (dy, -dx) off the middle, so the arc's midpoint is half that
+    for (a, b), (label, rad) in arc_labels.items():
+        (x1, y1), (x2, y2) = ax.transData.transform([pos[a], pos[b]])
+        scale = rad / 2 * 72 / fig.dpi
+        offset = (scale * (y2 - y1), -scale * (x2 - x1))
+        middle = ((pos[a][0] + pos[b][0]) / 2, (pos[a][1] + pos[b][1]) / 2)
+        ax.annotate(label, middle, xytext=offset, textcoords='offset points', ha='center', va='center',
+                    fontsize=12, bbox=dict(boxstyle='round', ec='white', fc='white'))
     
-    # Save to buffer
-    buf = BytesIO()
-    plt.savefig(buf, format="png", dpi=300)
-    buf.seek(0)
-    plt.close()
+    # Save as SVG so the browser rasterizes it instead of matplotlib
+    buf = StringIO()
+    fig.savefig(buf, format="svg")
+    plt.close(fig)
     
-    return buf
+    return buf.getvalue()
+
+def build_dot(start, end, transitions):
+    # Emit the whole DOT source with one join over the transitions rather than
+    # calling Digraph.edge() per transition
+    src, sym, dst = transitions
+    edges = ';\n'.join(
+        f'q{a}->q{b}[label="{symbol.translate(DOT_ESCAPES)}"]'
+        for a, symbol, b in zip(src, sym, dst)
+    )
+    return ('digraph{rankdir=LR;overlap=false;node[shape=circle];start[shape=point];start->q%d;\n%s;\nq%d[shape=doublecircle]}'
+            % (start, edges, end))
+
+def visualize_nfa_graphviz(start, end, transitions, engine="neato"):
+    # neato is much faster than the default hierarchical dot layout for automata.
+    # Render to SVG in memory instead of writing .gv/.png files to disk.
+    graphviz = load_graphviz()
+    return graphviz.Source(build_dot(start, end, transitions), engine=engine).pipe(format='svg', encoding='utf-8')
+
+def responsive_svg(svg):
+    # Drop the root <svg>'s fixed width/height so it scales with the column through its
+    # viewBox, never past its natural size or DIAGRAM_MAX_WIDTH (the widest column the
+    # iframe height is sized for). Returns the HTML and the height it needs.
+    tag = SVG_TAG.search(svg)
+    _, _, view_width, view_height = map(float, SVG_VIEWBOX.search(tag.group()).group(1).replace(',', ' ').split())
+    width = SVG_WIDTH.search(tag.group())
+    natural_width = float(width.group(1)) * (4 / 3 if width.group(2) == 'pt' else 1) if width else view_width
+    max_width = min(natural_width, DIAGRAM_MAX_WIDTH)
+    
+    html = (f'<style>body{{margin:0}} svg{{width:100%;height:auto}}</style>'
+            f'<div style="max-width:{max_width:.0f}px">'
+            f'{SVG_SIZE_ATTRS.sub("", tag.group())}{svg[tag.end():]}</div>')
+    height = max_width * view_height / view_width
+    return html, int(height) + 1
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def compile_and_render(regex, backend):
+    # Streamlit reruns the whole script on every interaction, so cache the full
+    # regex -> postfix -> NFA -> SVG pipeline. Only plain data is returned
+    # (the SVG is a few KB of text) so the cached value pickles cheaply.
+    postfix = infix_to_postfix(regex)
+    
+    start, end, transitions = build_nfa(postfix, make_state_factory())
+    if start is None:
+        return postfix, None
+    
+    library, _, layout = backend.partition('-')
+    if library == "graphviz":
+        svg = visualize_nfa_graphviz(start, end, transitions, engine=layout)
+    else:
+        svg = visualize_nfa(start, end, transitions, layout=layout)
+    
+    nfa = {
+        "start": start,
+        "end": end,
+        "num_states": len(set(transitions[0]) | set(transitions[2])),
+        "transitions": transitions,
+        "svg": responsive_svg(svg),
+    }
+    return postfix, nfa
 
 def validate_regex(regex):
     # Simple validation for common regex errors
@@ -221,6 +488,9 @@ with st.expander("📚 Regular Expression Examples", expanded=False):
 col1, col2 = st.columns([3, 1])
 with col1:
     regex_input = st.text_input("Enter Regular Expression:", value="a(b|c)*d")
+    # Only offer backends whose package is installed, without importing it yet
+    backends = [name for name, package in BACKENDS.items() if backend_available(package)]
+    backend = st.selectbox("Layout backend:", backends)
 
 with col2:
     example_regex = st.selectbox(
@@ -245,38 +515,45 @@ if regex_input:
             # 1. Show original regex
             st.write(f"**Original Regex:** `{regex_input}`")
             
-            # 2. Convert to postfix
-            postfix = infix_to_postfix(regex_input)
+            # 2. Convert to postfix, build and render the NFA (cached per regex).
+            # st.cache_data hands back a freshly unpickled copy on every hit, so the
+            # session also keeps its latest result to serve unrelated widget reruns.
+            key = (regex_input, backend)
+            cached = st.session_state.get("nfa_result")
+            if cached and cached[0] == key:
+                postfix, nfa = cached[1]
+            else:
+                postfix, nfa = compile_and_render(regex_input, backend)
+                if nfa:
+                    st.session_state["nfa_result"] = (key, (postfix, nfa))
             st.write(f"**Postfix Notation:** `{postfix}`")
             
-            # 3. Build and visualize NFA
-            State.count = 0  # Reset state counter
-            start, end, transitions = build_nfa(postfix)
-            
-            if start and end:
+            # 3. Show the NFA
+            if nfa:
+                transitions = nfa["transitions"]
                 # Display the transitions in a table
                 st.subheader("NFA Transitions")
                 transition_data = []
-                for src, symbol, dst in transitions:
+                for src, symbol, dst in zip(*transitions):
                     symbol_display = "ε" if symbol == "ε" else symbol
-                    transition_data.append({"From State": src, "Symbol": symbol_display, "To State": dst})
+                    transition_data.append({"From State": f"q{src}", "Symbol": symbol_display, "To State": f"q{dst}"})
                 
                 st.dataframe(transition_data, use_container_width=True)
                 
                 # Display the NFA diagram
                 st.subheader("NFA Diagram")
-                buf = visualize_nfa(start, end, transitions)
-                st.image(buf, use_container_width=True)
+                svg_html, svg_height = nfa["svg"]
+                components.html(svg_html, height=svg_height)
                 
                 # Explain NFA
                 with st.expander("NFA Explanation", expanded=True):
                     st.markdown(f"""
                     This NFA represents the regular expression `{regex_input}`.
                     
-                    - **Start state**: {start.id}
-                    - **Final/Accepting state**: {end.id}
-                    - **Number of states**: {State.count}
-                    - **Number of transitions**: {len(transitions)}
+                    - **Start state**: q{nfa["start"]}
+                    - **Final/Accepting state**: q{nfa["end"]}
+                    - **Number of states**: {nfa["num_states"]}
+                    - **Number of transitions**: {len(transitions[0])}
                     
                     The NFA processes input strings by following transitions based on the current input symbol.
                     Epsilon (ε) transitions can be taken without consuming any input.